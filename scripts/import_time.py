@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks the cold-start cost of importing pyg, using python -X importtime in a fresh interpreter for each scenario.
+
+    python scripts/import_time.py --repeat 5 --output import_time.csv
+
+prints, for each scenario, the best wall time and the total import time reported by -X importtime, together with the heaviest top-level imports.
+With --output, the results are appended to a csv so they can be tracked across versions.
+"""
+import argparse
+import csv
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+scenarios = {'import pyg': 'import pyg',
+             'dictable': 'from pyg import dictable',
+             'ewma': 'from pyg import ewma',
+             'mongo_table': 'from pyg import mongo_table',
+             'import *': 'from pyg import *'}
+
+
+def importtime(code, exclude = ()):
+    """
+    runs code in a fresh interpreter, returning the wall time and a dict of top-level module: cumulative import time in seconds.
+    modules in exclude (e.g. those imported by the interpreter at startup) are ignored
+    """
+    t0 = time.perf_counter()
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output = True, text = True, check = True).stderr
+    wall = time.perf_counter() - t0
+    modules = {}
+    for line in err.split('\n'):
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  ') and name.strip() not in exclude: ## indentation marks imports nested within another import
+            modules[name.strip()] = int(cumulative) / 1e6
+    return wall, modules
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'benchmark import time of pyg')
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--top', type = int, default = 5, help = 'number of heaviest imports to show')
+    parser.add_argument('--output', default = None, help = 'csv to append results to')
+    args = parser.parse_args(argv)
+    startup = set(importtime('pass')[1])
+    rows = []
+    for scenario, code in scenarios.items():
+        runs = [importtime(code, startup) for _ in range(args.repeat)]
+        wall, modules = min(runs, key = lambda run: run[0])
+        total = sum(modules.values())
+        rows.append(dict(date = datetime.datetime.now().isoformat(timespec = 'seconds'), python = sys.version.split()[0],
+                         scenario = scenario, wall = round(wall, 4), importtime = round(total, 4)))
+        heaviest = sorted(modules.items(), key = lambda item: -item[1])[:args.top]
+        print('%-12s wall %.3fs  importtime %.3fs  %s'%(scenario, wall, total, ', '.join('%s %.3fs'%item for item in heaviest)))
+    if args.output:
+        exists = os.path.exists(args.output)
+        with open(args.output, 'a', newline = '') as f:
+            writer = csv.DictWriter(f, fieldnames = list(rows[0]))
+            if not exists:
+                writer.writeheader()
+            writer.writerows(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
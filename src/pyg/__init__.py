@@ -1,61 +1,251 @@
-import pandas as pd; import numpy as np
+"""
+pyg is an umbrella over the pyg_xxx packages. Apart from pyg.base, which is needed to read the configuration,
+sub-packages are only imported when one of their symbols is first accessed, so that
+
+>>> from pyg import dictable
+
+does not pay for importing numba, pymongo, motor or sqlalchemy.
+Sub-packages listed under 'pyg_ignore' in cfg_read() are never imported.
+
+Setting the environment variable PYG_IMPORT_PROFILE (or 'pyg_import_profile' in cfg_read()) records the cost of importing each sub-package, see import_profile().
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import time
 from functools import partial, reduce
 
-try: 
-    from pyg.npy import *
-except Exception:
-    print('pyg_npy not imported')
-
-try:
-    from pyg.base import *
-    path = cfg_read().get('PYTHONPATH')
-    if path:
-        import sys
-        for p in as_list(path)[::-1]:
-            if p not in sys.path:
-                logger.info('added %s to sys.path'%p)
-                sys.path.insert(0, p)
-
-except Exception:
-    print('pyg_base not imported')
-
-try:
-    ignore = cfg_read().get('pyg_ignore', [])
-except Exception:
-    ignore = []
-
-if 'pyg_bond' not in ignore:
+#: sub-packages, in the order in which their symbols take precedence (later packages override earlier ones)
+_packages = dict(pyg_npy = 'pyg.npy',
+                 pyg_base = 'pyg.base',
+                 pyg_bond = 'pyg.bond',
+                 pyg_encoders = 'pyg.encoders',
+                 pyg_sql = 'pyg.sql',
+                 pyg_mongo = 'pyg.mongo',
+                 pyg_cell = 'pyg.cells',
+                 pyg_timeseries = 'pyg.timeseries')
+
+#: sub-packages as attributes of pyg, e.g. pyg.mongo
+_subpackages = {value.split('.')[-1] : package for package, value in _packages.items()}
+
+#: modules exposed as attributes of pyg
+_modules = dict(pd = 'pandas', np = 'numpy')
+
+_loaded = {}
+_ignore = []
+_names = None
+_profile = []
+_jit_listener = None
+_profiling = os.environ.get('PYG_IMPORT_PROFILE', '').lower() not in ('', '0', 'false')
+
+
+def _peak_rss():
+    """
+    peak resident set size of the process in MB, None if it cannot be measured
+    """
     try:
-        from pyg.bond import * 
-    except Exception:
-        print('pyg_bond not imported')
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20
+    except ImportError:
+        return None
+
+
+def _jit():
+    """
+    total time spent in numba compilation since profiling started listening, None if numba is not imported.
+    The listener is installed, process-wide, the first time this is called with numba imported, so it times both
+    compilations triggered while importing and the lazy compilation of compiled kernels on their first call.
+    """
+    global _jit_listener
+    if 'numba' not in sys.modules:
+        return None
+    if _jit_listener is None:
+        try:
+            from numba.core import event
+        except ImportError:
+            return None
+        _jit_listener = event.TimingListener()
+        event.register('numba:compile', _jit_listener)
+    return _jit_listener.duration if _jit_listener.done else 0.0
 
-if 'pyg_encoders' not in ignore:
+
+def _import(package, name):
+    """
+    imports name, recording the wall time, peak RSS increase, number of modules and time spent in numba compilation
+    """
+    row = dict(package = package, module = name, status = 'ok', time = 0.0, rss = None, modules = 0, jit = None)
+    rss = _peak_rss()
+    jit = _jit() if _profiling else None
+    n = len(sys.modules)
+    t0 = time.perf_counter()
     try:
-        from pyg.encoders import * 
-    except Exception:
-        print('pyg_encoders not imported')
+        module = importlib.import_module(name)
+    except Exception as e:
+        row['status'] = repr(e)
+        module = None
+    row['time'] = time.perf_counter() - t0
+    row['modules'] = len(sys.modules) - n
+    if rss is not None:
+        row['rss'] = _peak_rss() - rss
+    if _profiling:
+        jit1 = _jit()
+        row['jit'] = None if jit1 is None else jit1 - (jit or 0.0)
+    if _profiling or package == 'pyg_base': ## pyg_base is imported before we know if cfg asks for profiling
+        _profile.append(row)
+    return module
 
-if 'pyg_sql' not in ignore:
-    try: 
-        from pyg.sql import *
-    except Exception:
-        print('pyg_sql not imported')
 
-if 'pyg_mongo' not in ignore:
-    try: 
-        from pyg.mongo import *
-    except Exception:
-        print('pyg_mongo not imported')
+def _load(package):
+    """
+    imports a sub-package once, returning None if it is ignored or fails to import
+    """
+    if package in _loaded:
+        return _loaded[package]
+    if package in _ignore:
+        module = None
+        if _profiling:
+            _profile.append(dict(package = package, module = _packages[package], status = 'ignored', time = 0.0, rss = 0.0, modules = 0, jit = None))
+    else:
+        if _profiling and package == 'pyg_timeseries' and 'numba' not in sys.modules and importlib.util.find_spec('numba') is not None:
+            _import('numba', 'numba') ## so that compilation of the compiled kernels is timed separately from importing numba
+        module = _import(package, _packages[package])
+        if module is None:
+            print('%s not imported'%package)
+    _loaded[package] = module
+    return module
 
-if 'pyg_cell' not in ignore:
-    try: 
-        from pyg.cells import *
-    except Exception:
-        print('pyg_cell not imported')
 
-if 'pyg_timeseries' not in ignore:
-    try: 
-        from pyg.timeseries import *
+def import_profile():
+    """
+    returns a dictable of the cost of importing each sub-package of pyg, in order of import.
+    A final row, with package 'numba:compile', reports the total time spent compiling numba kernels in this process so far.
+    Since compiled kernels are jitted lazily, this is mostly incurred on first call of the timeseries functions rather than on import.
+    Profiling is enabled by setting the environment variable PYG_IMPORT_PROFILE = 1 or by adding 'pyg_import_profile': true to the cfg file.
+
+    :Columns:
+    ---------
+    package: the sub-package imported
+    module: the module imported
+    status: 'ok', 'ignored' (listed in pyg_ignore) or the exception raised on import
+    time: wall time in seconds
+    rss: increase in peak resident set size, in MB
+    modules: number of modules added to sys.modules
+    jit: time spent in numba compilation during the import, in seconds
+
+    :Example:
+    ---------
+    >>> import os; os.environ['PYG_IMPORT_PROFILE'] = '1'
+    >>> import pyg
+    >>> pyg.ewma(pyg.np.random.normal(0, 1, 100), 10)
+    >>> pyg.import_profile().inc(package = 'numba:compile')
+    """
+    from pyg.base import dictable
+    rows = list(_profile)
+    jit = _jit() if _profiling else None
+    if jit is not None:
+        rows.append(dict(package = 'numba:compile', module = None, status = 'ok', time = jit, rss = None, modules = 0, jit = jit))
+    return dictable(rows)
+
+
+def _public(module):
+    if module is None:
+        return []
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith('_')]
+    return names
+
+
+def _table():
+    """
+    returns the name -> sub-packages table, built by parsing the sub-packages' sources (see pyg._exports) without importing them.
+    Each name maps to the sub-packages exporting it, highest precedence first.
+    Sub-packages whose exports cannot be read statically are listed under the key None and are searched for every name.
+    """
+    global _names
+    if _names is None:
+        from pyg._exports import exports
+        _names = {}
+        for package in list(_packages)[::-1]:
+            names = exports(_packages[package])
+            if names is None:
+                _names.setdefault(None, []).append(package)
+            else:
+                for name in names:
+                    _names.setdefault(name, []).append(package)
+    return _names
+
+
+def _resolve(name):
+    """
+    finds name in the sub-packages, importing only those that export it.
+    Later sub-packages in _packages take precedence, irrespective of which sub-packages happen to be imported already.
+    """
+    if name in _modules:
+        return importlib.import_module(_modules[name])
+    if name in _subpackages:
+        module = _load(_subpackages[name])
+        if module is None: ## ignored or failed to import. An ignored sub-package can still be imported explicitly with import pyg.xxx
+            raise AttributeError('module %r has no attribute %r'%(__name__, name))
+        return module
+    table = _table()
+    candidates = set(table.get(name, [])) | set(table.get(None, []))
+    for package in list(_packages)[::-1]:
+        if package in candidates:
+            module = _load(package)
+            if module is not None and hasattr(module, name):
+                return getattr(module, name)
+    raise AttributeError('module %r has no attribute %r'%(__name__, name))
+
+
+def __getattr__(name):
+    if name == '__all__':
+        names = ['partial', 'reduce', 'import_profile'] + [key for key, module in _modules.items() if importlib.util.find_spec(module) is not None]
+        for key, package in _subpackages.items():
+            module = _load(package) ## ignored or failed sub-packages are left out
+            if module is not None:
+                names.append(key)
+                names.extend(_public(module))
+        res = list(dict.fromkeys(names))
+    elif name.startswith('__'):
+        raise AttributeError('module %r has no attribute %r'%(__name__, name))
+    else:
+        res = _resolve(name)
+    globals()[name] = res
+    return res
+
+
+def __dir__():
+    names = set(globals()) | set(_modules) | {key for key, package in _subpackages.items() if package not in _ignore} | set(_table()) - {None}
+    for module in _loaded.values():
+        names.update(_public(module))
+    return sorted(names)
+
+
+if _load('pyg_base') is not None:
+    from pyg.base import cfg_read, as_list, logger
+    try:
+        path = cfg_read().get('PYTHONPATH')
+        if path:
+            for p in as_list(path)[::-1]:
+                if p not in sys.path:
+                    logger.info('added %s to sys.path'%p)
+                    sys.path.insert(0, p)
+    except Exception:
+        print('PYTHONPATH not read from cfg')
+    try:
+        _ignore.extend(as_list(cfg_read().get('pyg_ignore', [])))
+        _profiling = _profiling or bool(cfg_read().get('pyg_import_profile', False))
     except Exception:
-        print('pyg_timeseries not imported')
+        pass
+
+if not _profiling:
+    del _profile[:]
@@ -0,0 +1,102 @@
+"""
+Reads the names a module exports by parsing its source, without importing it.
+
+pyg uses this to build its name -> sub-package table, so that resolving a name imports only the sub-package that defines it.
+"""
+import ast
+import os
+from importlib.machinery import PathFinder
+
+
+def _source(name):
+    """
+    returns the path of the source file of a module, found without importing it or its parents. None if there is no python source.
+    """
+    parts = name.split('.')
+    spec = PathFinder.find_spec(parts[0])
+    if spec is None:
+        return None
+    path = spec.origin
+    for part in parts[1:]:
+        if not spec.submodule_search_locations:
+            return None
+        spec = PathFinder.find_spec(part, list(spec.submodule_search_locations))
+        if spec is None:
+            return None
+        path = spec.origin
+    if path is None or not path.endswith('.py') or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _absolute(name, level, package):
+    if level == 0:
+        return name
+    parent = package.rsplit('.', level - 1)[0] if level > 1 else package
+    return parent + '.' + name if name else parent
+
+
+def _bound(body):
+    """
+    yields the statements that bind names at module level, including those inside if/try blocks
+    """
+    for node in body:
+        if isinstance(node, (ast.If, ast.Try)):
+            yield from _bound(node.body)
+            yield from _bound(node.orelse)
+            if isinstance(node, ast.Try):
+                for handler in node.handlers:
+                    yield from _bound(handler.body)
+                yield from _bound(node.finalbody)
+        else:
+            yield node
+
+
+def exports(name, prefix = 'pyg', _seen = None):
+    """
+    returns the public names exported by module 'name', as 'from name import *' would, by parsing its source.
+    Star-imports of modules whose name starts with prefix are followed.
+
+    :Returns:
+    ---------
+    set of names, or None if the exports cannot be determined statically (no python source, or a star-import of another library)
+    """
+    _seen = set() if _seen is None else _seen
+    if name in _seen:
+        return set()
+    _seen.add(name)
+    path = _source(name)
+    if path is None:
+        return None
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    package = name if os.path.basename(path) == '__init__.py' else name.rsplit('.', 1)[0]
+    names = set()
+    for node in _bound(tree.body):
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets):
+            try:
+                return set(ast.literal_eval(node.value))
+            except ValueError:
+                return None
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            for target in (node.targets if isinstance(node, ast.Assign) else [node.target]):
+                for n in ast.walk(target):
+                    if isinstance(n, ast.Name):
+                        names.add(n.id)
+        elif isinstance(node, ast.Import):
+            names.update(alias.asname or alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = _absolute(node.module, node.level, package)
+            for alias in node.names:
+                if alias.name != '*':
+                    names.add(alias.asname or alias.name)
+                elif module.startswith(prefix):
+                    star = exports(module, prefix, _seen)
+                    if star is None:
+                        return None
+                    names.update(star)
+                else:
+                    return None
+    return {n for n in names if not n.startswith('_')}
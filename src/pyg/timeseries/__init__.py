@@ -1,4 +1,10 @@
 from pyg_timeseries import *
+from pyg.timeseries._warmup import warmup, enable_cache
+from pyg.base import cfg_read as _cfg_read
+
+if _cfg_read().get('pyg_numba_cache'):
+    enable_cache() ## so that kernels are read from, and written to, the shared numba cache
+
 #from pyg.timeseries._decorators import compiled
 #from pyg.timeseries._ewm import ewma, ewma_, ewmstd, ewmvar, ewmstd_, ewmrms, ewmrms_, ewmskew, ewmskew_, ewmcor, ewmcor_, ewmcorr, ewmcorr_, ewmvar_, ewmLR, ewmLR_, ewmGLM, ewmGLM_
 #from pyg.timeseries._min import rolling_min, rolling_min_, expanding_min, expanding_min_
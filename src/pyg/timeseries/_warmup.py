@@ -0,0 +1,186 @@
+"""
+Ahead-of-time warmup of the numba kernels of pyg_timeseries.
+
+Kernels decorated with compiled are jitted on first call in every new process. warmup() switches on numba's on-disk cache for all of them
+and calls the public functions on float64/float32, 1-d/2-d data so that every kernel is compiled for these types and written to disk.
+
+compiled is a plain njit, so a process only reads the disk cache once caching is switched on for its kernels:
+
+- if 'pyg_numba_cache' is set in cfg_read(), importing pyg.timeseries (including through pyg.ewma etc.) calls enable_cache() automatically
+- otherwise, each worker must call enable_cache(path) (or warmup(path)) before its first kernel call.
+
+Importing pyg_timeseries directly, bypassing pyg.timeseries, does neither.
+
+From the command line:
+
+    python -m pyg.timeseries._warmup --cache /shared/numba_cache
+
+or, once installed, pyg_warmup --cache /shared/numba_cache
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+import numpy as np
+
+#: keyword arguments used to call each single-timeseries function
+_warmups = dict(ewma = dict(n = 10), ewmstd = dict(n = 10), ewmvar = dict(n = 10), ewmrms = dict(n = 10), ewmskew = dict(n = 10),
+                rolling_mean = dict(n = 10), rolling_sum = dict(n = 10), rolling_rms = dict(n = 10), rolling_std = dict(n = 10), rolling_skew = dict(n = 10),
+                rolling_min = dict(n = 10), rolling_max = dict(n = 10), rolling_median = dict(n = 10), rolling_rank = dict(n = 10),
+                rolling_quantile = dict(n = 10, quantile = 0.5),
+                expanding_mean = {}, expanding_sum = {}, expanding_rms = {}, expanding_std = {}, expanding_skew = {},
+                expanding_min = {}, expanding_max = {}, expanding_median = {}, expanding_rank = {},
+                cumsum = {}, cumprod = {}, ffill = {}, bfill = {}, diff = {}, shift = {}, ratio = {},
+                ts_mean = {}, ts_sum = {}, ts_rms = {}, ts_std = {}, ts_skew = {}, ts_count = {}, ts_min = {}, ts_max = {}, ts_median = {},
+                ewmcorr = dict(n = 10))
+
+#: functions that only accept data of some dimensions
+_ndims = dict(ewmcorr = (2,))
+
+
+def _dispatcher_type():
+    try:
+        from numba.core.dispatcher import Dispatcher
+    except ImportError:
+        from numba.dispatcher import Dispatcher
+    return Dispatcher
+
+
+def _unwrap(value, Dispatcher):
+    """
+    pyg_base wrappers (e.g. pd2np stacked over compiled) keep the function they wrap as .function
+    """
+    seen = set()
+    while not isinstance(value, Dispatcher) and id(value) not in seen:
+        seen.add(id(value))
+        value = getattr(value, 'function', None)
+        if value is None:
+            return None
+    return value if isinstance(value, Dispatcher) else None
+
+
+def kernels():
+    """
+    returns all numba dispatchers defined in the pyg_timeseries modules, including those wrapped by pyg_base decorators, keyed by qualified name
+    """
+    importlib.import_module('pyg_timeseries')
+    Dispatcher = _dispatcher_type()
+    res = {}
+    for name, module in list(sys.modules.items()):
+        if module is None or not name.startswith('pyg_timeseries'):
+            continue
+        for key, value in list(vars(module).items()):
+            value = _unwrap(value, Dispatcher)
+            if value is not None:
+                py_func = value.py_func
+                res.setdefault('%s.%s'%(py_func.__module__, py_func.__qualname__), value)
+    return res
+
+
+def enable_cache(path = None):
+    """
+    switches on numba's on-disk cache for all kernels in pyg_timeseries.
+    Kernels already compiled in this process are written to the cache too, since enabling caching only affects later compilations.
+
+    :Parameters:
+    ------------
+    path: str
+        cache directory. Defaults to cfg_read()['pyg_numba_cache'], or if not set, numba's default of __pycache__ next to the source.
+
+    :Returns:
+    ---------
+    dict of kernel name: 'ok' or the error raised when saving its existing compilations
+    """
+    if path is None:
+        from pyg.base import cfg_read
+        path = cfg_read().get('pyg_numba_cache')
+    if path:
+        import numba
+        os.makedirs(path, exist_ok = True)
+        numba.config.CACHE_DIR = path
+        os.environ['NUMBA_CACHE_DIR'] = path ## so that child processes share it
+    res = {}
+    for name, dispatcher in kernels().items():
+        dispatcher.enable_caching()
+        try:
+            for sig, cres in dispatcher.overloads.items():
+                dispatcher._cache.save_overload(sig, cres)
+            res[name] = 'ok'
+        except Exception as e:
+            res[name] = 'not persisted: %r'%e
+    return res
+
+
+def _data(rng, dtype, ndim, n = 100):
+    a = rng.normal(0, 1, (n, 3) if ndim == 2 else n).astype(dtype)
+    a[5] = np.nan
+    return a
+
+
+def warmup(path = None, dtypes = ('float64', 'float32'), ndims = (1, 2), functions = None):
+    """
+    compiles all pyg_timeseries kernels for the standard signatures and persists them to numba's on-disk cache.
+    In a process where the cache is already populated, the kernels are loaded from disk instead.
+
+    :Parameters:
+    ------------
+    path: str
+        cache directory, defaults to cfg_read()['pyg_numba_cache']
+    dtypes: list of str
+        dtypes to compile for
+    ndims: list of int
+        dimensions of data to compile for
+    functions: list of str
+        names of functions to call. Defaults to all functions we know how to call.
+
+    :Returns:
+    ---------
+    dictable with columns function, dtype, ndim, status and time.
+    Kernels compiled before warmup() that could not be saved to the cache appear with their kernel name as function.
+
+    :Example:
+    ---------
+    >>> from pyg.timeseries import warmup
+    >>> res = warmup('/tmp/numba')
+    >>> res.exc(status = 'ok') ## any function that failed to run
+    """
+    from pyg.base import dictable
+    rows = [dict(function = name, dtype = None, ndim = None, status = status, time = 0.0) for name, status in enable_cache(path).items() if status != 'ok']
+    import pyg_timeseries
+    functions = list(_warmups) if functions is None else functions
+    rng = np.random.default_rng(0) ## leaves the global numpy random state untouched
+    for name in functions:
+        function = getattr(pyg_timeseries, name, None)
+        if function is None:
+            rows.append(dict(function = name, dtype = None, ndim = None, status = 'not found in pyg_timeseries', time = 0.0))
+            continue
+        kwargs = _warmups.get(name, {})
+        for dtype in dtypes:
+            for ndim in ndims:
+                if ndim not in _ndims.get(name, (ndim,)):
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    function(_data(rng, dtype, ndim), **kwargs)
+                    status = 'ok'
+                except Exception as e:
+                    status = repr(e)
+                rows.append(dict(function = name, dtype = dtype, ndim = ndim, status = status, time = time.perf_counter() - t0))
+    return dictable(rows)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'compile the pyg_timeseries numba kernels into the on-disk cache')
+    parser.add_argument('--cache', default = None, help = 'cache directory, defaults to pyg_numba_cache in cfg')
+    parser.add_argument('--dtypes', nargs = '+', default = ['float64', 'float32'])
+    parser.add_argument('--ndims', nargs = '+', type = int, default = [1, 2])
+    parser.add_argument('--functions', nargs = '+', default = None)
+    args = parser.parse_args(argv)
+    res = warmup(args.cache, dtypes = args.dtypes, ndims = args.ndims, functions = args.functions)
+    print(res)
+    return 0 if all(row['status'] == 'ok' for row in res) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
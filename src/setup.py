@@ -4,4 +4,4 @@ import platform
 from setuptools import setup, find_packages
 from distutils.core import Extension
 
-setup(name = 'pygpyg', version = '1.0.20230210', packages = find_packages(), python_requires = '>=3.6.')
\ No newline at end of file
+setup(name = 'pygpyg', version = '1.0.20230210', packages = find_packages(), python_requires = '>=3.7')
\ No newline at end of file
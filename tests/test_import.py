@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import time
+import os
+import pytest
+
+heavy = ['pyg_mongo', 'pyg_sql', 'pyg_cell', 'pyg_timeseries', 'numba', 'pymongo', 'motor', 'sqlalchemy']
+
+def _run(code, env = None):
+    t0 = time.time()
+    out = subprocess.run([sys.executable, '-c', code], capture_output = True, text = True, check = True, env = env).stdout
+    return time.time() - t0, out.strip().split('\n')[-1]
+
+
+_stubs = {'pyg_npy/__init__.py': 'x_npy = 1',
+          'pyg_base/__init__.py': 'def cfg_read(): return {}\ndef as_list(x): return x if isinstance(x, list) else [x]\nimport logging; logger = logging.getLogger()\ndef cell(): return "pyg_base"',
+          'pyg_bond/__init__.py': 'x_bond = 1',
+          'pyg_encoders/__init__.py': 'x_encoders = 1',
+          'pyg_sql/__init__.py': 'x_sql = 1',
+          'pyg_mongo/__init__.py': 'x_mongo = 1',
+          'pyg_cell/__init__.py': 'from pyg_cell._cell import *',
+          'pyg_cell/_cell.py': 'def cell(): return "pyg_cell"\n__all__ = ["cell"]',
+          'pyg_timeseries/__init__.py': 'ewma = "ewma"'}
+
+def _make_stubs(tmp_path, **overrides):
+    """
+    writes minimal pyg_xxx packages, so that the lazy loading of pyg can be tested in isolation, returning the environment to run with
+    """
+    for path, code in dict(_stubs, **{'%s/__init__.py'%key : value for key, value in overrides.items()}).items():
+        fname = tmp_path / path
+        fname.parent.mkdir(exist_ok = True)
+        fname.write_text(code)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    return dict(os.environ, PYTHONPATH = os.pathsep.join([str(tmp_path), src]))
+
+
+@pytest.fixture
+def stubs(tmp_path):
+    return _make_stubs(tmp_path)
+
+_loaded = 'print(sorted(m for m in sys.modules if m.startswith("pyg_") and "." not in m))'
+
+
+def test_import_pyg_is_lazy():
+    _, loaded = _run('import sys, pyg; print(sorted(m for m in %r if m in sys.modules))'%heavy)
+    assert loaded == '[]'
+    _, loaded = _run('import sys; from pyg import dictable; print(sorted(m for m in %r if m in sys.modules))'%heavy)
+    assert loaded == '[]'
+    _, loaded = _run('import sys; from pyg import ewma; print(sorted(m for m in ["pyg_mongo", "pyg_sql"] if m in sys.modules))')
+    assert loaded == '[]'
+
+
+def test_import_pyg_star():
+    _, names = _run('from pyg import *; print(all(name in globals() for name in ["dictable", "cell", "ewma", "mongo_table", "pd", "np"]))')
+    assert names == 'True'
+
+
+def test_import_pyg_precedence(stubs):
+    _, res = _run('import pyg; print(pyg.cell())', stubs)
+    assert res == 'pyg_cell'
+    _, res = _run('import pyg; pyg.x_npy; pyg.x_mongo; from pyg import cell; print(cell())', stubs)
+    assert res == 'pyg_cell'
+
+
+def test_import_pyg_only_imports_the_sub_package_needed(stubs):
+    _, res = _run('import sys, pyg; pyg.cell; %s'%_loaded, stubs)
+    assert res == "['pyg_base', 'pyg_cell']"
+    _, res = _run('import sys, pyg; assert not hasattr(pyg, "nothing"); %s'%_loaded, stubs)
+    assert res == "['pyg_base']"
+
+
+def test_import_pyg_sub_packages(stubs):
+    _, res = _run('import sys, pyg; print(pyg.mongo.x_mongo, pyg.cells.cell())', stubs)
+    assert res == '1 pyg_cell'
+
+
+def test_import_pyg_star_with_failed_sub_package(tmp_path):
+    env = _make_stubs(tmp_path, pyg_cell = 'raise ImportError("no cell")')
+    _, res = _run('from pyg import *; print(x_mongo, x_sql, cell(), "cells" in globals())', env)
+    assert res == '1 1 pyg_base False'
+    _, res = _run('import pyg; print(hasattr(pyg, "cells"))', env)
+    assert res == 'False'
+
+
+def test_import_pyg_star_with_ignored_sub_package(tmp_path):
+    env = _make_stubs(tmp_path, pyg_base = _stubs['pyg_base/__init__.py'].replace('return {}', 'return {"pyg_ignore": ["pyg_mongo"]}'))
+    _, res = _run('import sys; from pyg import *; print("x_mongo" in globals(), "mongo" in globals(), "pyg_mongo" in sys.modules)', env)
+    assert res == 'False False False'
+    _, res = _run('import sys, pyg; print(hasattr(pyg, "mongo"), hasattr(pyg, "x_mongo"), "pyg_mongo" in sys.modules)', env)
+    assert res == 'False False False'
+
+
+def test_import_profile():
+    code = 'import os; os.environ["PYG_IMPORT_PROFILE"] = "1"; import pyg; pyg.ewma; p = pyg.import_profile(); print(sorted(p.package))'
+    _, packages = _run(code)
+    assert "'pyg_base'" in packages and "'pyg_timeseries'" in packages
+    code = 'import os; os.environ["PYG_IMPORT_PROFILE"] = "1"; import pyg; pyg.ewma(pyg.np.random.normal(0, 1, 100), 10); print(pyg.import_profile().inc(package = "numba:compile")[0].jit)'
+    _, jit = _run(code)
+    assert float(jit) > 0
+    _, packages = _run('import pyg; pyg.ewma; print(len(pyg.import_profile()))')
+    assert packages == '0'
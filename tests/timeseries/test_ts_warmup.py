@@ -0,0 +1,49 @@
+from pyg.timeseries import warmup, ewma
+from pyg.timeseries._warmup import kernels, main
+import numpy as np
+import numba
+import os
+import pytest
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """
+    restores numba's cache directory and switches caching back off for all kernels once the test is done
+    """
+    monkeypatch.setattr(numba.config, 'CACHE_DIR', numba.config.CACHE_DIR)
+    monkeypatch.setenv('NUMBA_CACHE_DIR', os.environ.get('NUMBA_CACHE_DIR', ''))
+    for dispatcher in kernels().values():
+        monkeypatch.setattr(dispatcher, '_cache', dispatcher._cache)
+    return str(tmp_path)
+
+
+def _cached(path):
+    return [f for _, _, files in os.walk(path) for f in files if f.endswith('.nbi')]
+
+
+def test_ts_warmup(cache):
+    assert any(name.endswith('._ewma') for name in kernels()) ## wrapped by pd2np
+    a = np.random.normal(0, 1, 100)
+    ewma(a, 10) ## compiled before warmup, must still be persisted
+    np.random.seed(1)
+    res = warmup(cache, functions = ['ewma', 'rolling_std'])
+    x = np.random.normal()
+    np.random.seed(1)
+    assert np.random.normal() == x ## global random state untouched
+    assert len(res) == 8
+    assert set(res.status) == {'ok'}
+    assert any('._ewma-' in f for f in _cached(cache))
+
+
+def test_ts_warmup_ewmcorr_and_missing_functions(cache):
+    res = warmup(cache, functions = ['ewmcorr', 'not_a_function'])
+    assert res.inc(function = 'ewmcorr').ndim == [2, 2]
+    assert set(res.inc(function = 'ewmcorr').status) == {'ok'}
+    assert res.inc(function = 'not_a_function').status == ['not found in pyg_timeseries']
+
+
+def test_ts_warmup_main(cache):
+    assert main(['--cache', cache, '--functions', 'ewma']) == 0
+    assert main(['--cache', cache, '--functions', 'ewma', '--dtypes', 'not_a_dtype']) == 1
+    assert main(['--cache', cache, '--functions', 'ewmaa']) == 1